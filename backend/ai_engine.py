@@ -6,9 +6,19 @@ Falls back to rule-based answers if API key is missing or call fails.
 """
 
 from __future__ import annotations
-import re
+import os
+import threading
+import weakref
 from config import Config
 from gov_knowledge import KNOWLEDGE_BASE, FALLBACK_RESPONSE
+from answer_cache import AnswerCache
+
+# Imported once at module load so a pre-fork master (gunicorn --preload)
+# pays the SDK import cost and workers inherit it copy-on-write.
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
 
 # ══════════════════════════════════════════════════════════════
 #  SYSTEM PROMPT — defines the officer's personality & scope
@@ -59,45 +69,130 @@ OFFICIAL HELPLINES TO CITE:
 - MGNREGA: 1800-111-555 | nrega.nic.in
 - Certificates: crsorgi.gov.in | DigiLocker: digilocker.gov.in"""
 
+LANGUAGE_INSTRUCTIONS: dict[str, str] = {
+    "hi-IN": "Respond in Hindi (हिंदी). Use Devanagari script.",
+    "ta-IN": "Respond in Tamil (தமிழ்).",
+    "te-IN": "Respond in Telugu (తెలుగు).",
+    "bn-IN": "Respond in Bengali (বাংলা).",
+    "mr-IN": "Respond in Marathi (मराठी).",
+}
+
+# ══════════════════════════════════════════════════════════════
+#  IMMUTABLE SHARED STATE — built once at import, never mutated.
+#  Safe to preload in a pre-fork master and share across workers.
+# ══════════════════════════════════════════════════════════════
+SYSTEM_PROMPTS: dict[str, str] = {
+    lang: f"{SYSTEM_PROMPT}\n\nLANGUAGE INSTRUCTION: {instruction}"
+    for lang, instruction in LANGUAGE_INSTRUCTIONS.items()
+}
+
+# Pre-split keyword matchers — avoids re-splitting every KB key per request
+KEYWORD_MATCHERS: tuple[tuple[tuple[str, ...], str], ...] = tuple(
+    (tuple(keywords.split("|")), response)
+    for keywords, response in KNOWLEDGE_BASE.items()
+)
+
+GREETING_WORDS = ("hello", "hi", "namaste", "hey", "good morning", "good evening")
+THANKS_WORDS   = ("thank", "thanks", "shukriya", "dhanyawad")
+
+
+# ══════════════════════════════════════════════════════════════
+#  PER-WORKER STATE — HTTP clients and locks must not cross a fork
+# ══════════════════════════════════════════════════════════════
+_ENGINES: "weakref.WeakSet[AIEngine]" = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    """Drop clients and locks inherited from the parent process."""
+    for engine in list(_ENGINES):
+        engine._reset_worker_state()
+
+
+if hasattr(os, "register_at_fork"):   # not available on Windows
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 class AIEngine:
     def __init__(self, cfg: Config):
         self.cfg = cfg
+        self._reset_worker_state()
+        _ENGINES.add(self)
+
+        if not self.cfg.ANTHROPIC_API_KEY:
+            print("  ⚠️  WARNING: ANTHROPIC_API_KEY not set in .env — using rule-based fallback")
+        elif anthropic is None:
+            print("  ❌ ERROR: anthropic package not installed!")
+            print("     Run: pip install anthropic")
+
+    def _reset_worker_state(self):
+        """
+        (Re)create per-process state — called from __init__ and, via the
+        at-fork hook, in every forked worker. The client is built lazily.
+        """
         self._client = None
-        self._init_claude()
+        self._client_tried = False
+        self._client_lock = threading.Lock()
+        self._answers = None
+        if self.cfg.ANSWER_CACHE_ENABLED:
+            self._answers = AnswerCache(
+                max_entries=self.cfg.ANSWER_CACHE_SIZE,
+                threshold=self.cfg.ANSWER_CACHE_THRESHOLD,
+                ttl_seconds=self.cfg.ANSWER_CACHE_TTL,
+            )
+
+    def _get_client(self):
+        """Return this process's Anthropic client, creating it on first call."""
+        with self._client_lock:
+            if not self._client_tried:   # init is tried once; result may be None
+                self._client = self._init_claude()
+                self._client_tried = True
+        return self._client
 
     def _init_claude(self):
         """Initialize the Anthropic client."""
-        if not self.cfg.ANTHROPIC_API_KEY:
-            print("  ⚠️  WARNING: ANTHROPIC_API_KEY not set in .env — using rule-based fallback")
-            return
+        if not self.cfg.ANTHROPIC_API_KEY or anthropic is None:
+            return None
 
         try:
-            import anthropic
-            self._client = anthropic.Anthropic(api_key=self.cfg.ANTHROPIC_API_KEY)
-            # Quick validation — list models to confirm key works
-            print(f"  ✅ Claude client ready — model: {self.cfg.ANTHROPIC_MODEL}")
-        except ImportError:
-            print("  ❌ ERROR: anthropic package not installed!")
-            print("     Run: pip install anthropic")
+            client = anthropic.Anthropic(api_key=self.cfg.ANTHROPIC_API_KEY)
+            print(f"  ✅ Claude client ready (pid {os.getpid()}) — model: {self.cfg.ANTHROPIC_MODEL}")
+            return client
         except Exception as e:
             print(f"  ❌ ERROR: Could not init Anthropic client: {e}")
+            return None
+
+    def answer_cache_stats(self) -> dict | None:
+        """Hit/miss counters of this worker's answer cache, None if disabled."""
+        return self._answers.stats() if self._answers is not None else None
 
     def generate_reply(self, user_message: str, history: list, language: str = "en-IN") -> str:
         """
         Generate a reply using Claude Haiku.
         Falls back to rule-based if Claude is unavailable.
+
+        First-turn questions are checked against the near-duplicate answer
+        cache; a hit reuses an earlier Claude reply in the same language.
         """
-        if self._client:
+        client = self._get_client()
+        if client:
+            # history already holds the current message, so 1 == first turn
+            first_turn = len(history) <= 1 and self._answers is not None
+            if first_turn:
+                cached = self._answers.lookup(user_message, language)
+                if cached is not None:
+                    return cached
             try:
-                return self._claude_reply(user_message, history, language)
+                reply = self._claude_reply(client, user_message, history, language)
+                if first_turn:
+                    self._answers.store(user_message, language, reply)
+                return reply
             except Exception as e:
                 print(f"  ⚠️  Claude API error: {e} — falling back to rule-based")
 
         # Fallback to local knowledge base
         return self._rule_based_reply(user_message)
 
-    def _claude_reply(self, user_message: str, history: list, language: str) -> str:
+    def _claude_reply(self, client, user_message: str, history: list, language: str) -> str:
         """Call Claude Haiku with full conversation history."""
 
         # Build messages array — include previous turns for context
@@ -114,19 +209,10 @@ class AIEngine:
         # Always add current user message last
         messages.append({"role": "user", "content": user_message})
 
-        # Add language instruction to system prompt if non-English
-        system = SYSTEM_PROMPT
-        lang_map = {
-            "hi-IN": "Respond in Hindi (हिंदी). Use Devanagari script.",
-            "ta-IN": "Respond in Tamil (தமிழ்).",
-            "te-IN": "Respond in Telugu (తెలుగు).",
-            "bn-IN": "Respond in Bengali (বাংলা).",
-            "mr-IN": "Respond in Marathi (मराठी).",
-        }
-        if language in lang_map:
-            system += f"\n\nLANGUAGE INSTRUCTION: {lang_map[language]}"
-
-        response = self._client.messages.create(
+        # Prebuilt system prompt with language instruction if non-English
+        system = SYSTEM_PROMPTS.get(language, SYSTEM_PROMPT)
+
+        response = client.messages.create(
             model=self.cfg.ANTHROPIC_MODEL,
             max_tokens=self.cfg.MAX_TOKENS,
             temperature=self.cfg.TEMPERATURE,
@@ -143,18 +229,18 @@ class AIEngine:
         """
         msg = message.lower()
 
-        for keywords, response in KNOWLEDGE_BASE.items():
-            if any(kw in msg for kw in keywords.split("|")):
+        for keywords, response in KEYWORD_MATCHERS:
+            if any(kw in msg for kw in keywords):
                 return response
 
         # Greeting
-        if any(w in msg for w in ["hello", "hi", "namaste", "hey", "good morning", "good evening"]):
+        if any(w in msg for w in GREETING_WORDS):
             return ("Namaste! 🙏 I am Officer Rajiv Sharma, your AI Digital Government Officer. "
                     "I specialise in Scholarships, Pensions, Ration Cards, Land Records, "
                     "Employment Schemes, and Birth/Death Certificates. "
                     "How may I assist you today, Ji?")
 
-        if any(w in msg for w in ["thank", "thanks", "shukriya", "dhanyawad"]):
+        if any(w in msg for w in THANKS_WORDS):
             return ("You are most welcome, Ji! 😊 "
                     "Serving the citizens of India is my honour and duty. "
                     "Is there anything else I can help you with?")
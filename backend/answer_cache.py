@@ -0,0 +1,284 @@
+"""
+answer_cache.py — Near-duplicate question cache using MinHash + LSH banding.
+
+Citizens ask the same thing many ways ("scholarship kaise apply kare",
+"how to apply scholarship online"). Exact-match caching misses these, so
+first-turn questions are fingerprinted with MinHash over character shingles
+and bucketed by band. MinHash only *finds* candidates. A hit must pass two
+checks. First, exact Jaccard similarity on the stored shingle sets. Second,
+the content words must pair up both ways: every word in one question
+needs a counterpart in the other. One extra or swapped word ("status",
+"urban", "death", "not") moves shingle Jaccard only a little but changes
+the question. Counterparts may differ by a typo or plural. Short words,
+numbers and negations must match exactly. Fully local — no embedding
+service.
+
+Memory is bounded: at most `max_entries` questions are kept, least recently
+used first out, and every entry expires `ttl_seconds` after it was stored so
+stale scheme details are not served forever. Questions that look personal
+or specific (digits, names) are never stored, so a reply tailored to one
+citizen is not handed to another.
+"""
+
+from __future__ import annotations
+import random
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH       = (1 << 32) - 1
+
+# Keep letters/digits of any script (Devanagari, Tamil, ...) incl. combining marks
+_NON_WORD = re.compile(r"[^\w\u0900-\u0DFF]+", re.UNICODE)
+
+# Title-case word after the first one — likely a person or place name
+_PROPER_NOUN = re.compile(r"(?<=\s)[A-Z][a-z]+\b")
+
+# Question filler in English, Hinglish and Hindi. Without this, "how to
+# apply for old age pension" and "how to apply for widow pension" look alike.
+# Question words other than "how" (what/when/why...) stay: they change intent.
+STOP_WORDS = frozenset("""
+    a an the i my me we our you your is are am be can could do does did how
+    to for of in on at by with from and or
+    please tell get make want need about process online
+    kaise kare karen karna kya hai hain ka ke ki ko se me mein ke liye liye
+    kaha kahan banaye banane batao
+    कैसे करें करे क्या है हैं का के की को से में लिए कहाँ कहां बताएं ऑनलाइन
+""".split())
+
+NEGATION_WORDS = frozenset("""
+    not no never cannot without nahi nahin nhi na mat
+    नहीं नही ना मत बिना
+""".split())
+
+NUMBER_WORDS = frozenset("""
+    one two three four five six seven eight nine ten eleven twelve
+    first second third fourth fifth sixth seventh eighth ninth tenth
+    eleventh twelfth
+    एक दो तीन चार पांच पाँच छह सात आठ नौ दस ग्यारह बारह
+""".split())
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, strip punctuation and filler words, split into words."""
+    text = text.lower().replace("n't", " not")
+    return [w for w in _NON_WORD.sub(" ", text).split()
+            if w not in STOP_WORDS]
+
+
+def _exact_only(word: str) -> bool:
+    """
+    Words that only match themselves: short codes ("up"/"mp", "sc"/"st"),
+    numbers and negations. One edit turns these into a different word.
+    """
+    return (len(word) <= 3 or word in NEGATION_WORDS or word in NUMBER_WORDS
+            or any(ch.isdigit() for ch in word))
+
+
+def _within_edits(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance(a, b) <= limit, stopping early once exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return False
+        prev = cur
+    return prev[-1] <= limit
+
+
+def words_match(a: str, b: str) -> bool:
+    """Same word up to a typo or inflection (scholarship/scholarships)."""
+    if a == b:
+        return True
+    if _exact_only(a) or _exact_only(b):
+        return False
+    return _within_edits(a, b, 1 if min(len(a), len(b)) < 8 else 2)
+
+
+def same_content(words_a: frozenset[str], words_b: frozenset[str]) -> bool:
+    """Every content word on each side has a matching word on the other."""
+    return (all(any(words_match(a, b) for b in words_b) for a in words_a) and
+            all(any(words_match(b, a) for a in words_a) for b in words_b))
+
+
+def shingles(words: list[str], k: int = 3) -> frozenset[int]:
+    """
+    Character k-grams taken inside each padded word, hashed to 32 bits.
+    Per-word shingling makes the set insensitive to word order
+    ("apply scholarship" == "scholarship apply").
+    """
+    out = set()
+    for word in words:
+        padded = f" {word} "
+        if len(padded) <= k:
+            out.add(zlib.crc32(padded.encode("utf-8")))
+            continue
+        for i in range(len(padded) - k + 1):
+            out.add(zlib.crc32(padded[i:i + k].encode("utf-8")))
+    return frozenset(out)
+
+
+def is_cacheable(question: str) -> bool:
+    """
+    False for questions that look personal or too specific to share:
+    anything with digits (class, age, Aadhaar, phone) or a capitalised
+    name after the first word ("I am Ramesh from Sitapur ...").
+    """
+    if any(ch.isdigit() for ch in question):
+        return False
+    return _PROPER_NOUN.search(question.strip()) is None
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int = 2000, threshold: float = 0.75,
+                 ttl_seconds: float = 6 * 3600,
+                 num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.max_entries = max_entries
+        self.threshold   = threshold
+        self.ttl_seconds = ttl_seconds
+        self.num_perm    = num_perm
+        self.bands       = bands
+        self.rows        = num_perm // bands
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        # entry_id -> (language, signature, shingles, words, answer, expires_at)
+        # order = LRU
+        self._entries: OrderedDict[int, tuple] = OrderedDict()
+        # (language, band_no, band_values) -> {entry_id, ...}
+        self._buckets: dict[tuple, set[int]] = {}
+        # (expires_at, entry_id) in insertion order — TTL is fixed, so this
+        # is also expiry order and expired entries pop off the left
+        self._expiry: deque[tuple[float, int]] = deque()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.hits   = 0
+        self.misses = 0
+
+    # ── Hashing ────────────────────────────────────────────────
+    def signature(self, grams: frozenset[int]) -> tuple[int, ...]:
+        """MinHash signature of a non-empty shingle set."""
+        return tuple(
+            min(((a * g + b) % _MERSENNE_PRIME) & _MAX_HASH for g in grams)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, language: str, sig: tuple[int, ...]) -> list[tuple]:
+        r = self.rows
+        return [(language, i, sig[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(grams_a: frozenset[int], grams_b: frozenset[int]) -> float:
+        """Exact Jaccard similarity of two shingle sets."""
+        return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+    # ── Public API ─────────────────────────────────────────────
+    def lookup(self, question: str, language: str) -> str | None:
+        """Return a stored answer for a near-duplicate question, or None."""
+        words = normalize(question)
+        grams = shingles(words)
+        if not grams:
+            return None
+        sig, content = self.signature(grams), frozenset(words)
+
+        with self._lock:
+            self._evict_expired()
+            candidates = set()
+            for key in self._band_keys(language, sig):
+                candidates |= self._buckets.get(key, set())
+
+            best_id, best_score = None, self.threshold
+            for entry_id in candidates:
+                _, _, entry_grams, entry_words, _, _ = self._entries[entry_id]
+                score = self.similarity(grams, entry_grams)
+                if score >= best_score and same_content(content, entry_words):
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id][4]
+
+    def store(self, question: str, language: str, answer: str) -> bool:
+        """
+        Remember the answer to a question, evicting the LRU entry if full.
+        Returns False if the question was not cacheable.
+        """
+        if self.max_entries <= 0 or not is_cacheable(question):
+            return False
+        words = normalize(question)
+        grams = shingles(words)
+        if not grams:
+            return False
+        sig = self.signature(grams)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._evict_expired()
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (language, sig, grams, frozenset(words),
+                                       answer, expires_at)
+            self._expiry.append((expires_at, entry_id))
+            for key in self._band_keys(language, sig):
+                self._buckets.setdefault(key, set()).add(entry_id)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, entry_id = self._expiry.popleft()
+            if entry_id in self._entries:     # may already be LRU-evicted
+                self._remove(entry_id)
+
+    def _remove(self, entry_id: int) -> None:
+        language, sig, *_ = self._entries.pop(entry_id)
+        for key in self._band_keys(language, sig):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters — exposed on the health route."""
+        with self._lock:
+            return {
+                "entries":   len(self._entries),
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._expiry.clear()
+            self.hits   = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -11,14 +11,52 @@ Setup:
   2. Copy .env.example → .env and add your ANTHROPIC_API_KEY
   3. python app.py
   4. Open your React frontend at localhost:3000
+
+Pre-fork deployment (copy-on-write):
+  gunicorn --preload -w 4 -b 0.0.0.0:5000 "app:create_app()"
+
+  --preload imports this module and calls create_app() once in the master:
+  Flask, the Anthropic SDK, the knowledge base matchers and the prebuilt
+  system prompts are shared by every worker. The Claude HTTP client and its
+  lock are created lazily inside each worker after the fork (see
+  AIEngine._get_client).
+
+  Limitation: conversation history lives in each worker's memory
+  (ConversationManager is per process). Multi-worker mode therefore needs
+  sticky sessions — a proxy that routes every request of a session_id to
+  the same worker. Without them a follow-up can land on a worker that has
+  never seen the session: it loses its history and is treated as a first
+  turn.
 """
 
+import time
+
+# ── Import-time measurements (milliseconds, per phase) ─────────
+# Filled once while this module imports; each app gets its own copy
+# extended with its create_app time (app.config["STARTUP_TIMINGS"]).
+STARTUP_TIMINGS: dict[str, float] = {}
+_t_start = time.perf_counter()
+
+
+def _mark(phase: str, since: float, timings: dict | None = None) -> float:
+    """Record elapsed ms for a startup phase; return the new checkpoint."""
+    now = time.perf_counter()
+    (STARTUP_TIMINGS if timings is None else timings)[phase] = round((now - since) * 1000, 2)
+    return now
+
+
+_t = _t_start
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+_t = _mark("import_flask", _t)
 from config import Config
-from ai_engine import AIEngine
+_t = _mark("import_config", _t)
+from ai_engine import AIEngine          # also imports anthropic + builds prompts
+_t = _mark("import_ai_engine", _t)
 from conversation import ConversationManager
 import logging
+_t = _mark("import_misc", _t)
+_mark("import_total", _t_start)
 
 # ── Logging ────────────────────────────────────────────────────
 logging.basicConfig(
@@ -28,122 +66,143 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
-# ── App Setup ──────────────────────────────────────────────────
-app = Flask(__name__)
-CORS(app, origins=[
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    "http://localhost:5173",   # Vite dev server
-    "http://127.0.0.1:5173",
-])
-
-cfg  = Config()
-ai   = AIEngine(cfg)
-conv = ConversationManager(max_history=cfg.MAX_HISTORY)
-
-log.info("=" * 52)
-log.info("  AI Digital Government Officer — Online")
-log.info(f"  Provider : {cfg.AI_PROVIDER}")
-log.info(f"  Model    : {cfg.ANTHROPIC_MODEL}")
-log.info(f"  Port     : 5000")
-log.info("=" * 52)
-
-# ── Routes ─────────────────────────────────────────────────────
-
-@app.route("/", methods=["GET"])
-def health():
-    """Health check — frontend can ping this to confirm server is up."""
-    return jsonify({
-        "status": "online",
-        "officer": "AI Digital Government Officer",
-        "provider": cfg.AI_PROVIDER,
-        "model": cfg.ANTHROPIC_MODEL,
-        "version": "2.0.0",
-        "services": ["scholarships", "pension", "ration_card",
-                     "land_records", "employment", "certificates"]
-    })
-
-
-@app.route("/chat", methods=["POST"])
-def chat():
+# ── App Factory ────────────────────────────────────────────────
+def create_app(cfg: Config | None = None) -> Flask:
     """
-    Main chat endpoint — called by React frontend on every message.
-
-    Request JSON:
-        {
-            "message":    "How do I apply for a scholarship?",
-            "session_id": "abc123",      (optional, default="default")
-            "language":   "en-IN"        (optional, for language context)
-        }
-
-    Response JSON:
-        {
-            "reply":      "To apply for a National Scholarship...",
-            "session_id": "abc123",
-            "provider":   "anthropic"
-        }
+    Build the Flask app with its engine and session store.
+
+    This is the WSGI entry point (see module docstring). Everything
+    constructed here is fork-safe: AIEngine defers its HTTP client until
+    the first request in each worker process.
     """
-    data         = request.get_json(silent=True) or {}
-    user_message = data.get("message", "").strip()
-    session_id   = data.get("session_id", "default")
-    language     = data.get("language", "en-IN")
-
-    if not user_message:
-        return jsonify({"error": "Empty message"}), 400
-
-    log.info(f"[{session_id}] User: {user_message[:80]}")
-
-    # Store user message & get history for Claude's context window
-    conv.add_message(session_id, "user", user_message)
-    history = conv.get_history(session_id)
-
-    # Generate reply via Claude
-    reply = ai.generate_reply(
-        user_message=user_message,
-        history=history,
-        language=language
-    )
-
-    # Store Claude's reply
-    conv.add_message(session_id, "assistant", reply)
-
-    log.info(f"[{session_id}] Officer: {reply[:80]}...")
-
-    return jsonify({
-        "reply":      reply,
-        "session_id": session_id,
-        "provider":   cfg.AI_PROVIDER,
-    })
-
-
-@app.route("/reset", methods=["POST"])
-def reset():
-    """Clear the conversation history for a given session."""
-    data       = request.get_json(silent=True) or {}
-    session_id = data.get("session_id", "default")
-    conv.clear(session_id)
-    log.info(f"[{session_id}] Conversation cleared")
-    return jsonify({"status": "cleared", "session_id": session_id})
-
-
-@app.route("/services", methods=["GET"])
-def services():
-    """Returns the six government service categories this officer handles."""
-    return jsonify({"services": [
-        {"id": "scholarships", "name": "Scholarships & Education",  "icon": "📚",
-         "description": "NSP, PM Scholarship, Pragati, state scholarships"},
-        {"id": "pension",      "name": "Pensions & Senior Citizen", "icon": "🧓",
-         "description": "Old Age, Widow, Disability pensions (NSAP/IGNOAPS)"},
-        {"id": "ration_card",  "name": "Ration Card & PDS",         "icon": "🪪",
-         "description": "New card, update, ONORC, food grain entitlements"},
-        {"id": "land_records", "name": "Land Records & Property",   "icon": "🏠",
-         "description": "Khata, Khasra, mutation, Bhu-Naksha, ROR download"},
-        {"id": "employment",   "name": "Employment Schemes",        "icon": "💼",
-         "description": "MGNREGA job card, PM-KISAN, PMAY, skill schemes"},
-        {"id": "certificates", "name": "Birth / Death Certificates","icon": "📄",
-         "description": "Registration, download, correction via CRS portal"},
-    ]})
+    t0 = time.perf_counter()
+    cfg = cfg or Config()
+
+    app = Flask(__name__)
+    CORS(app, origins=[
+        "http://localhost:3000",
+        "http://127.0.0.1:3000",
+        "http://localhost:5173",   # Vite dev server
+        "http://127.0.0.1:5173",
+    ])
+
+    ai   = AIEngine(cfg)
+    conv = ConversationManager(max_history=cfg.MAX_HISTORY)
+    app.extensions["ai_engine"] = ai
+
+    # ── Routes ─────────────────────────────────────────────────
+
+    @app.route("/", methods=["GET"])
+    def health():
+        """Health check — frontend can ping this to confirm server is up."""
+        return jsonify({
+            "status": "online",
+            "officer": "AI Digital Government Officer",
+            "provider": cfg.AI_PROVIDER,
+            "model": cfg.ANTHROPIC_MODEL,
+            "version": "2.0.0",
+            "services": ["scholarships", "pension", "ration_card",
+                         "land_records", "employment", "certificates"],
+            "answer_cache": ai.answer_cache_stats(),   # per worker; null if off
+        })
+
+
+    @app.route("/chat", methods=["POST"])
+    def chat():
+        """
+        Main chat endpoint — called by React frontend on every message.
+
+        Request JSON:
+            {
+                "message":    "How do I apply for a scholarship?",
+                "session_id": "abc123",      (optional, default="default")
+                "language":   "en-IN"        (optional, for language context)
+            }
+
+        Response JSON:
+            {
+                "reply":      "To apply for a National Scholarship...",
+                "session_id": "abc123",
+                "provider":   "anthropic"
+            }
+        """
+        data         = request.get_json(silent=True) or {}
+        user_message = data.get("message", "").strip()
+        session_id   = data.get("session_id", "default")
+        language     = data.get("language", "en-IN")
+
+        if not user_message:
+            return jsonify({"error": "Empty message"}), 400
+
+        log.info(f"[{session_id}] User: {user_message[:80]}")
+
+        # Store user message & get history for Claude's context window
+        conv.add_message(session_id, "user", user_message)
+        history = conv.get_history(session_id)
+
+        # Generate reply via Claude
+        reply = ai.generate_reply(
+            user_message=user_message,
+            history=history,
+            language=language
+        )
+
+        # Store Claude's reply
+        conv.add_message(session_id, "assistant", reply)
+
+        log.info(f"[{session_id}] Officer: {reply[:80]}...")
+
+        return jsonify({
+            "reply":      reply,
+            "session_id": session_id,
+            "provider":   cfg.AI_PROVIDER,
+        })
+
+
+    @app.route("/reset", methods=["POST"])
+    def reset():
+        """Clear the conversation history for a given session."""
+        data       = request.get_json(silent=True) or {}
+        session_id = data.get("session_id", "default")
+        conv.clear(session_id)
+        log.info(f"[{session_id}] Conversation cleared")
+        return jsonify({"status": "cleared", "session_id": session_id})
+
+
+    @app.route("/services", methods=["GET"])
+    def services():
+        """Returns the six government service categories this officer handles."""
+        return jsonify({"services": [
+            {"id": "scholarships", "name": "Scholarships & Education",  "icon": "📚",
+             "description": "NSP, PM Scholarship, Pragati, state scholarships"},
+            {"id": "pension",      "name": "Pensions & Senior Citizen", "icon": "🧓",
+             "description": "Old Age, Widow, Disability pensions (NSAP/IGNOAPS)"},
+            {"id": "ration_card",  "name": "Ration Card & PDS",         "icon": "🪪",
+             "description": "New card, update, ONORC, food grain entitlements"},
+            {"id": "land_records", "name": "Land Records & Property",   "icon": "🏠",
+             "description": "Khata, Khasra, mutation, Bhu-Naksha, ROR download"},
+            {"id": "employment",   "name": "Employment Schemes",        "icon": "💼",
+             "description": "MGNREGA job card, PM-KISAN, PMAY, skill schemes"},
+            {"id": "certificates", "name": "Birth / Death Certificates","icon": "📄",
+             "description": "Registration, download, correction via CRS portal"},
+        ]})
+
+    timings = dict(STARTUP_TIMINGS)
+    _mark("create_app", t0, timings)
+    timings["total"] = round(timings["import_total"] + timings["create_app"], 2)
+    app.config["STARTUP_TIMINGS"] = timings
+
+    log.info("=" * 52)
+    log.info("  AI Digital Government Officer — Online")
+    log.info(f"  Provider : {cfg.AI_PROVIDER}")
+    log.info(f"  Model    : {cfg.ANTHROPIC_MODEL}")
+    log.info(f"  Port     : 5000")
+    log.info(f"  Startup  : {timings}")
+    log.info("=" * 52)
+
+    return app
 
 
 if __name__ == "__main__":
+    app = create_app()
     app.run(debug=True, host="127.0.0.1", port=5000)
\ No newline at end of file
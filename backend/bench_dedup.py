@@ -0,0 +1,305 @@
+"""
+bench_dedup.py — Precision/recall and latency benchmark for AnswerCache.
+
+Each intent group below holds paraphrases of one citizen question in
+English, Hinglish and native script. The first paraphrase is stored; every
+other paraphrase (same language tag) is looked up and must return that
+group's answer. NEAR_MISS_PAIRS are stored questions next to a wording
+that differs only by service, number, negation, birth/death, state or
+action, or an added qualifier; the second must never get the first's
+answer. HELD_OUT_PAIRS are the same kind of test, written after the
+matching rules were fixed, and reported separately.
+
+Every pass is repeated over many MinHash seeds and the mean and worst
+precision/recall are reported. Exits non-zero if any wrong answer is served.
+
+Usage:
+  python bench_dedup.py
+  python bench_dedup.py --threshold 0.7 --bands 32 --seeds 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+from answer_cache import AnswerCache
+
+# (intent, language, [paraphrases...]) — first entry is the stored question
+QUESTION_SET = [
+    ("scholarship_apply", "en-IN", [
+        "how to apply scholarship online",
+        "How do I apply for a scholarship online?",
+        "scholarship apply process",
+        "scholarship kaise apply kare",
+        "apply scholarship online process",
+    ]),
+    ("scholarship_apply", "hi-IN", [
+        "स्कॉलरशिप के लिए आवेदन कैसे करें",
+        "स्कॉलरशिप आवेदन कैसे करें?",
+        "स्कॉलरशिप के लिए ऑनलाइन आवेदन कैसे करें",
+    ]),
+    ("old_age_pension", "en-IN", [
+        "how to apply for old age pension",
+        "old age pension apply kaise kare",
+        "How can I apply for old-age pension?",
+        "apply old age pension online",
+    ]),
+    ("old_age_pension", "hi-IN", [
+        "वृद्धा पेंशन के लिए आवेदन कैसे करें",
+        "वृद्धा पेंशन आवेदन कैसे करें",
+        "वृद्धा पेंशन का आवेदन कैसे करें?",
+    ]),
+    ("ration_card_new", "en-IN", [
+        "how to make new ration card",
+        "new ration card kaise banaye",
+        "How do I make a new ration card?",
+        "new ration card banane ka process",
+    ]),
+    ("ration_card_new", "ta-IN", [
+        "புதிய ரேஷன் கார்டு எப்படி விண்ணப்பிப்பது",
+        "புதிய ரேஷன் கார்டு விண்ணப்பிப்பது எப்படி?",
+    ]),
+    ("birth_certificate", "en-IN", [
+        "how to download birth certificate",
+        "birth certificate download kaise kare",
+        "How can I download my birth certificate online?",
+        "download birth certificate online",
+    ]),
+    ("birth_certificate", "bn-IN", [
+        "জন্ম সনদ কিভাবে ডাউনলোড করব",
+        "জন্ম সনদ ডাউনলোড কিভাবে করব?",
+    ]),
+    ("mgnrega_job_card", "en-IN", [
+        "how to get mgnrega job card",
+        "mgnrega job card kaise banaye",
+        "How do I get an MGNREGA job card?",
+        "apply mgnrega job card",
+    ]),
+    ("land_mutation", "en-IN", [
+        "how to do land mutation online",
+        "land mutation online kaise kare",
+        "online land mutation process",
+        "How do I apply for land mutation online?",
+    ]),
+    ("pm_kisan_status", "en-IN", [
+        "how to check pm kisan status",
+        "pm kisan status kaise check kare",
+        "check PM-KISAN payment status",
+        "PM Kisan status check online",
+    ]),
+]
+
+# Near misses: (category, language, stored question, different question).
+# Each stored question is cached; its partner must NOT get that answer.
+NEAR_MISS_PAIRS = [
+    ("service", "en-IN", "how to apply for old age pension", "how to apply for widow pension"),
+    ("service", "en-IN", "how to apply for old age pension",
+     "how to apply for disability pension"),
+    ("service", "en-IN", "how to apply scholarship online", "how to check scholarship status"),
+    ("service", "en-IN", "how to check pm kisan status", "pm kisan ekyc kaise kare"),
+    ("service", "hi-IN", "वृद्धा पेंशन के लिए आवेदन कैसे करें",
+     "विधवा पेंशन के लिए आवेदन कैसे करें"),
+    ("number", "en-IN", "scholarship for class 10", "scholarship for class 12"),
+    ("number", "en-IN", "scholarship for class ten", "scholarship for class twelve"),
+    ("number", "en-IN", "scholarship for tenth pass students",
+     "scholarship for twelfth pass students"),
+    ("number", "en-IN", "pension at age 60", "pension at age 80"),
+    ("number", "hi-IN", "दस वीं के बाद छात्रवृत्ति", "बारह वीं के बाद छात्रवृत्ति"),
+    ("negation", "en-IN", "is widow pension available", "is widow pension not available"),
+    ("negation", "en-IN", "does pm kisan need aadhaar", "does pm kisan not need aadhaar"),
+    ("negation", "en-IN", "can I download birth certificate from digilocker",
+     "can't I download birth certificate from digilocker"),
+    ("negation", "en-IN", "ration card milega", "ration card nahi milega"),
+    ("negation", "hi-IN", "राशन कार्ड मिलेगा", "राशन कार्ड नहीं मिलेगा"),
+    ("birth/death", "en-IN", "how to download birth certificate",
+     "how to download death certificate"),
+    ("birth/death", "en-IN", "birth certificate correction", "death certificate correction"),
+    ("birth/death", "en-IN", "late birth registration process", "late death registration process"),
+    ("birth/death", "hi-IN", "जन्म प्रमाण पत्र डाउनलोड", "मृत्यु प्रमाण पत्र डाउनलोड"),
+    ("state", "en-IN", "old age pension up", "old age pension mp"),
+    ("state", "en-IN", "bhulekh land records uttar pradesh",
+     "bhulekh land records madhya pradesh"),
+    ("state", "en-IN", "ration card bihar", "ration card punjab"),
+    ("state", "en-IN", "land records odisha", "land records kerala"),
+    ("state", "en-IN", "scholarship for sc students", "scholarship for st students"),
+    ("action", "en-IN", "add name in ration card", "remove name from ration card"),
+    ("action", "en-IN", "add member in ration card", "delete member from ration card"),
+    ("action", "en-IN", "link aadhaar with ration card", "delink aadhaar from ration card"),
+    ("action", "en-IN", "update bank account in pm kisan", "update mobile number in pm kisan"),
+    ("action", "en-IN", "apply new ration card", "surrender ration card"),
+    ("action", "hi-IN", "राशन कार्ड में नाम जोड़ना", "राशन कार्ड से नाम हटाना"),
+    ("qualifier", "en-IN", "pm kisan registration", "pm kisan registration status"),
+    ("qualifier", "en-IN", "how to apply for pmay housing scheme",
+     "how to apply for pmay urban housing scheme"),
+]
+
+# Held-out near misses, written after the matching rules were fixed and never
+# used to tune them. Reported on their own so the result is not a fit.
+HELD_OUT_PAIRS = [
+    ("held-out", "en-IN", "scholarship for girls", "scholarship for boys"),
+    ("held-out", "en-IN", "is aadhaar mandatory for ration card",
+     "is aadhaar optional for ration card"),
+    ("held-out", "en-IN", "pmay rural eligibility", "pmay urban eligibility"),
+    ("held-out", "en-IN", "pm kisan beneficiary status", "pm kisan beneficiary registration"),
+    ("held-out", "en-IN", "widow pension eligibility", "widow pension amount"),
+    ("held-out", "en-IN", "ration card documents required", "ration card fees"),
+    ("held-out", "en-IN", "domicile certificate download", "domicile certificate download fee"),
+    ("held-out", "en-IN", "disability pension for adults", "disability pension for children"),
+    ("held-out", "en-IN", "land mutation application", "land mutation rejected"),
+    ("held-out", "en-IN", "scholarship renewal", "scholarship fresh application"),
+    ("held-out", "en-IN", "mgnrega wages payment", "mgnrega wages delayed payment"),
+    ("held-out", "en-IN", "ration card for migrant workers",
+     "ration card for construction workers"),
+    ("held-out", "en-IN", "pension for farmers", "insurance for farmers"),
+    ("held-out", "en-IN", "caste certificate apply", "income certificate apply"),
+    ("held-out", "hi-IN", "लड़कियों के लिए छात्रवृत्ति", "लड़कों के लिए छात्रवृत्ति"),
+    ("held-out", "hi-IN", "राशन कार्ड की स्थिति", "राशन कार्ड आवेदन की स्थिति"),
+    ("held-out", "hi-IN", "किसान पेंशन योजना", "किसान बीमा योजना"),
+]
+
+# Domain vocabulary for filling the cache to capacity in latency runs
+FILLER_WORDS = [
+    "pension", "scholarship", "ration", "card", "land", "records", "mutation",
+    "certificate", "kisan", "mgnrega", "housing", "widow", "status", "apply",
+    "download", "eligibility", "documents", "renewal", "urban", "rural",
+    "girls", "students", "farmers", "income", "caste", "domicile", "bank",
+    "aadhaar", "mobile", "update", "correction", "portal", "helpline",
+]
+
+
+def run(seed: int, threshold: float, num_perm: int, bands: int) -> dict:
+    """One benchmark pass with the MinHash permutations drawn from `seed`."""
+    cache = AnswerCache(threshold=threshold, num_perm=num_perm,
+                        bands=bands, seed=seed)
+    for intent, language, questions in QUESTION_SET:
+        cache.store(questions[0], language, intent)
+    already = {(language, qs[0]) for _, language, qs in QUESTION_SET}
+    for category, language, stored, _ in NEAR_MISS_PAIRS + HELD_OUT_PAIRS:
+        if (language, stored) not in already:
+            cache.store(stored, language, f"near:{stored}")
+
+    tp = fp = fn = 0
+    wrong = []
+    for intent, language, questions in QUESTION_SET:
+        for q in questions[1:]:
+            got = cache.lookup(q, language)
+            if got == intent:
+                tp += 1
+            elif got is None:
+                fn += 1
+            else:
+                fp += 1
+                wrong.append(("paraphrase", q, got))
+
+    for category, language, stored, q in NEAR_MISS_PAIRS:
+        got = cache.lookup(q, language)
+        if got is not None:
+            fp += 1
+            wrong.append((category, q, got))
+
+    # Cross-language: an en-IN paraphrase must never hit under hi-IN
+    for intent, language, questions in QUESTION_SET:
+        if language == "en-IN":
+            got = cache.lookup(questions[1], "hi-IN")
+            if got is not None:
+                fp += 1
+                wrong.append(("language", questions[1], got))
+
+    held_out_hits = 0
+    for category, language, stored, q in HELD_OUT_PAIRS:
+        got = cache.lookup(q, language)
+        if got is not None:
+            held_out_hits += 1
+            wrong.append((category, q, got))
+
+    return {
+        "precision": tp / (tp + fp) if tp + fp else 1.0,
+        "recall":    tp / (tp + fn) if tp + fn else 0.0,
+        "held_out_precision": tp / (tp + held_out_hits) if tp + held_out_hits else 1.0,
+        "wrong":     wrong,
+    }
+
+
+def full_cache_latency(size: int, num_perm: int, bands: int) -> dict:
+    """
+    Fill a cache to `size` entries with synthetic domain questions, then time
+    stores (each one evicts) and lookups of the benchmark queries against
+    the full cache — the configured ANSWER_CACHE_SIZE, not a toy one.
+    """
+    rng = random.Random(0)
+    cache = AnswerCache(max_entries=size, num_perm=num_perm, bands=bands)
+
+    def filler(i: int) -> str:
+        tag = "".join(chr(97 + (i // 26 ** k) % 26) for k in range(3))
+        return " ".join(rng.sample(FILLER_WORDS, rng.randint(2, 4))) + f" scheme{tag}"
+
+    for i in range(size):
+        cache.store(filler(i), "en-IN", str(i))
+    store_ms = []
+    for i in range(size, size + 1000):
+        t0 = time.perf_counter()
+        cache.store(filler(i), "en-IN", str(i))
+        store_ms.append((time.perf_counter() - t0) * 1000)
+
+    for intent, language, questions in QUESTION_SET:
+        cache.store(questions[0], language, intent)
+    queries = [(language, q) for _, language, qs in QUESTION_SET for q in qs[1:]]
+    queries += [(language, q) for _, language, _, q in NEAR_MISS_PAIRS + HELD_OUT_PAIRS]
+    lookup_ms = []
+    for language, q in queries:
+        t0 = time.perf_counter()
+        cache.lookup(q, language)
+        lookup_ms.append((time.perf_counter() - t0) * 1000)
+
+    lookup_ms.sort()
+    return {
+        "entries":    len(cache),
+        "store_ms":   statistics.median(store_ms),
+        "lookup_ms":  statistics.median(lookup_ms),
+        "lookup_p95": lookup_ms[int(len(lookup_ms) * 0.95)],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threshold", type=float, default=0.75)
+    parser.add_argument("--num-perm",  type=int,   default=64)
+    parser.add_argument("--bands",     type=int,   default=16)
+    parser.add_argument("--seeds",     type=int,   default=50)
+    parser.add_argument("--size",      type=int,
+                        default=int(os.getenv("ANSWER_CACHE_SIZE", "2000")))
+    args = parser.parse_args()
+
+    results = [run(seed, args.threshold, args.num_perm, args.bands)
+               for seed in range(args.seeds)]
+    precision = [r["precision"] for r in results]
+    recall    = [r["recall"] for r in results]
+    held_out  = [r["held_out_precision"] for r in results]
+    latency   = full_cache_latency(args.size, args.num_perm, args.bands)
+
+    print(f"AnswerCache  threshold={args.threshold}  num_perm={args.num_perm}  "
+          f"bands={args.bands}  seeds={args.seeds}")
+    print(f"  queries        {sum(len(q) - 1 for _, _, q in QUESTION_SET)} paraphrases, "
+          f"{len(NEAR_MISS_PAIRS)} near misses, {len(HELD_OUT_PAIRS)} held-out")
+    print(f"  precision      mean {statistics.mean(precision):.3f}  worst {min(precision):.3f}")
+    print(f"  held-out prec. mean {statistics.mean(held_out):.3f}  worst {min(held_out):.3f}")
+    print(f"  recall         mean {statistics.mean(recall):.3f}  worst {min(recall):.3f}")
+    print(f"  full cache     {latency['entries']} / {args.size} entries")
+    print(f"  lookup         median {latency['lookup_ms']:.3f} ms  "
+          f"p95 {latency['lookup_p95']:.3f} ms")
+    print(f"  store          median {latency['store_ms']:.3f} ms (with eviction)")
+
+    wrong = {}
+    for r in results:
+        for category, q, got in r["wrong"]:
+            wrong[(category, q, got)] = wrong.get((category, q, got), 0) + 1
+    for (category, q, got), n in sorted(wrong.items()):
+        print(f"  ❌ [{category}] {q!r} -> {got!r} in {n}/{args.seeds} seeds")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
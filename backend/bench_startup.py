@@ -0,0 +1,126 @@
+"""
+bench_startup.py — Cold-start benchmark for the backend.
+
+Imports app.py and calls create_app() in a fresh interpreter several times
+and reports the median of each phase in app.config["STARTUP_TIMINGS"]. Then
+preloads the app here, forks, and checks the child rebuilt its per-worker
+state (Claude client, lock, answer cache) instead of inheriting it.
+Exits non-zero if the median total exceeds the budget or the fork check
+fails, so it can guard startup in CI.
+
+Usage:
+  python bench_startup.py                 (5 runs, 2000 ms budget)
+  python bench_startup.py --runs 10 --budget-ms 1500
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = (
+    "import json, app; "
+    "print(json.dumps(app.create_app().config['STARTUP_TIMINGS']))"
+)
+
+
+def run_once() -> dict[str, float]:
+    """Build the app in a new process and return its recorded timings."""
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    # Banner/log lines go to stderr; the timings are the last stdout line
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_fork() -> list[str] | None:
+    """
+    Preload like gunicorn --preload, then fork. Returns a list of problems
+    (empty if all good), or None where fork is unavailable (Windows).
+    """
+    if not hasattr(os, "fork"):
+        return None
+
+    sys.path.insert(0, HERE)
+    import ai_engine
+    import app as app_module
+
+    problems = []
+    if not ai_engine.SYSTEM_PROMPTS or not ai_engine.KEYWORD_MATCHERS:
+        problems.append("prompts/matchers not built at import")
+    if importlib.util.find_spec("anthropic") and "anthropic" not in sys.modules:
+        problems.append("anthropic SDK not preloaded")
+
+    ai = app_module.create_app().extensions["ai_engine"]
+
+    # Simulate a master that already has a client and holds its lock mid-fork
+    ai._client, ai._client_tried = object(), True
+    parent_lock, parent_answers = ai._client_lock, ai._answers
+    parent_lock.acquire()
+
+    pid = os.fork()
+    if pid == 0:
+        child = []
+        if ai._client is not None or ai._client_tried:
+            child.append("child inherited the parent's Claude client")
+        if ai._client_lock is parent_lock or ai._client_lock.locked():
+            child.append("child inherited the parent's client lock")
+        if parent_answers is not None and ai._answers is parent_answers:
+            child.append("child inherited the parent's answer cache")
+        if not child:                    # would deadlock on an inherited held lock
+            ai._get_client()
+        if not child and not ai._client_tried:
+            child.append("client init not recorded in the child")
+        if child:
+            print("\n".join(child), flush=True)
+        os._exit(1 if child else 0)
+
+    parent_lock.release()
+    _, status = os.waitpid(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        problems.append("fork check failed in child (see output above)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("STARTUP_BUDGET_MS", "2000")))
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+
+    print(f"Startup phases — median of {args.runs} cold imports (ms)")
+    for phase in samples[0]:
+        median = statistics.median(s[phase] for s in samples)
+        print(f"  {phase:<18} {median:>9.2f}")
+
+    failed = False
+    total = statistics.median(s["total"] for s in samples)
+    if total > args.budget_ms:
+        print(f"❌ Startup {total:.2f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    else:
+        print(f"✅ Startup {total:.2f} ms within budget {args.budget_ms:.0f} ms")
+
+    problems = check_fork()
+    if problems is None:
+        print("⚠️  Fork check skipped — os.fork not available on this platform")
+    elif problems:
+        for p in problems:
+            print(f"❌ {p}")
+        failed = True
+    else:
+        print("✅ Fork check: shared state preloaded, per-worker state rebuilt in child")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,4 +20,10 @@ class Config:
     # ── Generation settings ──────────────────────────────────────
     MAX_TOKENS:   int   = int(os.getenv("MAX_TOKENS",   "600"))
     TEMPERATURE:  float = float(os.getenv("TEMPERATURE", "0.5"))
-    MAX_HISTORY:  int   = int(os.getenv("MAX_HISTORY",  "10"))   # last 10 exchanges kept
\ No newline at end of file
+    MAX_HISTORY:  int   = int(os.getenv("MAX_HISTORY",  "10"))   # last 10 exchanges kept
+
+    # ── Near-duplicate answer cache (first-turn questions only, off by default) ──
+    ANSWER_CACHE_ENABLED:   bool  = os.getenv("ANSWER_CACHE_ENABLED", "false").lower() == "true"
+    ANSWER_CACHE_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.75"))
+    ANSWER_CACHE_SIZE:      int   = int(os.getenv("ANSWER_CACHE_SIZE", "2000"))
+    ANSWER_CACHE_TTL:       int   = int(os.getenv("ANSWER_CACHE_TTL", "21600"))   # seconds (6 h)
\ No newline at end of file